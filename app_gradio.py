@@ -9,19 +9,52 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
 import csv
+import functools
+import io
+import os
 import re
+import shutil
 import socket
 import sys
 import tempfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
 
 import gradio as gr
 
-from wjx_to_docx import BatchResult, ExportResult, export_one_url, validate_url
+from wjx_to_docx import (
+    MAX_CONCURRENT_SESSIONS,
+    MAX_EXPORT_WORKERS,
+    BatchResult,
+    ExportResult,
+    check_dependencies,
+    export_one_url,
+    validate_url,
+)
+
+
+_URL_SPLIT_RE = re.compile(r"[,\n，;；\s\"]+")
+_COPY_BUFFER_SIZE = 1 << 20
+# 批量处理时界面刷新的最小间隔（秒），避免每条链接都把完整日志和表格推送给前端
+UI_REFRESH_INTERVAL = 0.25
+STATUS_MAP = {"success": "成功"}
+# docx 本身就是 deflate 压缩过的 ZIP，再压缩只会白白消耗 CPU
+_STORED_SUFFIXES = {".docx", ".zip", ".png", ".jpg"}
+# 设置 WJX_VERBOSE=1 时才把批量日志同步打印到终端
+_VERBOSE = os.environ.get("WJX_VERBOSE") == "1"
+# 导出专用线程池：asyncio.to_thread 使用的默认线程池只有 min(32, CPU 数 + 4) 个线程，
+# 一个批量任务就能占满，其他会话的短任务只能排队；这里按所有会话的并发导出上限单独开池
+_EXPORT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_SESSIONS * MAX_EXPORT_WORKERS,
+    thread_name_prefix="wjx-export",
+)
 
 
 CSS = """
@@ -77,26 +110,41 @@ CSS = """
 """
 
 
+# (秒级时间戳, 格式化结果)，同一秒内的日志复用已格式化的字符串；整体替换元组以保证多线程下读写一致
+_now_cache: Tuple[int, str] = (0, "")
+
+
 def now_str() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _now_cache
+    sec = int(time.time())
+    cached_sec, text = _now_cache
+    if sec != cached_sec:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        _now_cache = (sec, text)
+    return text
 
 
 def split_url_tokens(raw: str) -> List[str]:
     if not raw:
         return []
-    parts = re.split(r"[,\n，;；\s]+", raw.strip())
+    parts = _URL_SPLIT_RE.split(raw.strip())
     urls = [p.strip() for p in parts if p.strip()]
     return urls
 
 
 def read_text_file_auto(path: Path) -> str:
-    encodings = ["utf-8-sig", "utf-8", "gbk", "gb18030"]
-    for enc in encodings:
-        try:
-            return path.read_text(encoding=enc)
-        except UnicodeDecodeError:
-            continue
-    return path.read_text(encoding="utf-8", errors="ignore")
+    data = path.read_bytes()
+    if data.startswith(codecs.BOM_UTF8):
+        return data[len(codecs.BOM_UTF8) :].decode("utf-8", errors="ignore")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    # gb18030 是 gbk 的超集，无需再单独尝试 gbk
+    try:
+        return data.decode("gb18030")
+    except UnicodeDecodeError:
+        return data.decode("utf-8", errors="ignore")
 
 
 def extract_urls_from_file(path: Optional[str]) -> List[str]:
@@ -106,27 +154,21 @@ def extract_urls_from_file(path: Optional[str]) -> List[str]:
     if not p.exists():
         return []
 
-    content = read_text_file_auto(p)
-    if p.suffix.lower() == ".csv":
-        rows: List[str] = []
-        reader = csv.reader(content.splitlines())
-        for row in reader:
-            rows.extend(row)
-        return split_url_tokens("\n".join(rows))
-    return split_url_tokens(content)
+    # 分隔正则已覆盖逗号、分号、空白和 CSV 引号，txt 与 csv 统一按同一规则切分
+    return split_url_tokens(read_text_file_auto(p))
 
 
 def dedupe_keep_order(items: Iterable[str]) -> List[str]:
-    seen = set()
-    out: List[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            out.append(item)
-    return out
+    return list(dict.fromkeys(items))
+
 
+def find_free_port(start: Optional[int] = None, end: Optional[int] = None) -> int:
+    if start is None or end is None:
+        # 未指定端口范围时直接让内核分配空闲端口，一次 bind 即可
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
 
-def find_free_port(start: int = 7860, end: int = 7999) -> int:
     for port in range(start, end + 1):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -138,7 +180,10 @@ def find_free_port(start: int = 7860, end: int = 7999) -> int:
     raise RuntimeError("未找到可用端口，请关闭占用端口后重试。")
 
 
+@functools.lru_cache(maxsize=None)
 def ensure_writable_dir(path: Path) -> bool:
+    # Windows 上 os.access 忽略 ACL，几乎总返回 True，因此必须实际写入探针文件；
+    # 结果按目录缓存，同一进程内每个输出根目录只探测一次
     try:
         path.mkdir(parents=True, exist_ok=True)
         probe = path / ".write_test"
@@ -150,43 +195,47 @@ def ensure_writable_dir(path: Path) -> bool:
 
 
 def create_run_output_dir(run_id: str) -> Path:
-    local = Path.cwd() / "outputs" / run_id
-    if ensure_writable_dir(local):
-        return local
-
-    temp_dir = Path(tempfile.gettempdir()) / "wjx_export" / run_id
-    if ensure_writable_dir(temp_dir):
-        return temp_dir
+    for base in (Path.cwd() / "outputs", Path(tempfile.gettempdir()) / "wjx_export"):
+        if not ensure_writable_dir(base):
+            continue
+        run_dir = base / run_id
+        try:
+            run_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            continue
+        return run_dir
     raise RuntimeError("无法创建输出目录，请检查目录权限。")
 
 
 def write_results_csv(path: Path, results: List[ExportResult]) -> Path:
     csv_path = path / "results.csv"
-    with csv_path.open("w", encoding="utf-8-sig", newline="") as f:
+    with csv_path.open("w", encoding="utf-8-sig", newline="", buffering=_COPY_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(
             ["url", "status", "title", "message", "docx_path", "json_path", "md_path", "error_code"]
         )
-        for item in results:
-            writer.writerow(
-                [
-                    item.url,
-                    item.status,
-                    item.title,
-                    item.message,
-                    item.docx_path or "",
-                    item.json_path or "",
-                    item.md_path or "",
-                    item.error_code,
-                ]
+        writer.writerows(
+            (
+                item.url,
+                item.status,
+                item.title,
+                item.message,
+                item.docx_path or "",
+                item.json_path or "",
+                item.md_path or "",
+                item.error_code,
             )
+            for item in results
+        )
     return csv_path
 
 
 def write_failed_urls(path: Path, results: List[ExportResult]) -> Path:
     failed_path = path / "failed_urls.txt"
-    failed_lines = [f"{item.url}\t{item.message}" for item in results if item.status != "success"]
-    failed_path.write_text("\n".join(failed_lines), encoding="utf-8")
+    with failed_path.open("w", encoding="utf-8", buffering=_COPY_BUFFER_SIZE) as f:
+        f.writelines(
+            f"{item.url}\t{item.message}\n" for item in results if item.status != "success"
+        )
     return failed_path
 
 
@@ -196,19 +245,42 @@ def write_log_file(path: Path, run_id: str, logs: str) -> Path:
     return log_path
 
 
-def build_zip_bundle(path: Path, run_id: str, files: List[str], extras: List[Path]) -> Path:
+def add_file_to_zip(zf: zipfile.ZipFile, p: Path) -> None:
+    entry = zipfile.ZipInfo.from_file(p, arcname=p.name)
+    if p.suffix.lower() in _STORED_SUFFIXES:
+        entry.compress_type = zipfile.ZIP_STORED
+    else:
+        entry.compress_type = zf.compression
+    with p.open("rb", buffering=_COPY_BUFFER_SIZE) as src, zf.open(
+        entry, "w", force_zip64=True
+    ) as dst:
+        shutil.copyfileobj(src, dst, length=_COPY_BUFFER_SIZE)
+
+
+def build_zip_bundle(
+    path: Path,
+    run_id: str,
+    files: List[str],
+    extras: List[Path],
+    logger: Optional[Callable[[str], None]] = None,
+) -> Path:
     zip_path = path / f"bundle_{run_id}.zip"
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for file_path in files:
-            p = Path(file_path)
-            if p.exists():
-                zf.write(p, arcname=p.name)
-        for extra in extras:
-            if extra.exists():
-                zf.write(extra, arcname=extra.name)
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        for p in [Path(f) for f in files] + list(extras):
+            # 文件刚由导出流程生成，正常情况下必然存在，缺失时直接跳过而不是每个都先 stat
+            try:
+                add_file_to_zip(zf, p)
+            except FileNotFoundError:
+                if logger:
+                    logger(f"[跳过] 打包时未找到文件: {p}")
     return zip_path
 
 
+@functools.lru_cache(maxsize=4096)
+def _validate_cached(url: str) -> bool:
+    return validate_url(url)
+
+
 def parse_input_urls(url_text: str, upload_file: Optional[str]) -> Tuple[List[str], List[str]]:
     from_text = split_url_tokens(url_text)
     from_file = extract_urls_from_file(upload_file)
@@ -217,7 +289,7 @@ def parse_input_urls(url_text: str, upload_file: Optional[str]) -> Tuple[List[st
     valid: List[str] = []
     invalid: List[str] = []
     for u in merged:
-        if validate_url(u):
+        if _validate_cached(u):
             valid.append(u)
         else:
             invalid.append(u)
@@ -231,7 +303,7 @@ def results_to_rows(results: List[ExportResult]) -> List[List[str]]:
             [
                 str(idx),
                 item.url,
-                "成功" if item.status == "success" else "失败",
+                STATUS_MAP.get(item.status, "失败"),
                 item.title or "-",
                 item.message,
             ]
@@ -239,24 +311,26 @@ def results_to_rows(results: List[ExportResult]) -> List[List[str]]:
     return rows
 
 
-def run_batch_export(url_text: str, upload_file: Optional[str]):
-    logs: List[str] = []
-    results: List[ExportResult] = []
+async def run_batch_export(url_text: str, upload_file: Optional[str]):
+    log_buf = io.StringIO()
     download_files: List[str] = []
     rows: List[List[str]] = []
 
+    def append_log(line: str) -> None:
+        if _VERBOSE:
+            print(line)
+        log_buf.write(line)
+        log_buf.write("\n")
+
     def logger(message: str) -> None:
-        line = f"[{now_str()}] {message}"
-        print(line)
-        logs.append(line)
+        append_log(f"[{now_str()}] {message}")
 
-    def log_text() -> str:
-        return "\n".join(logs)
+    log_text = log_buf.getvalue
 
     logger("开始收集输入链接...")
     yield log_text(), rows, download_files, None, None
 
-    valid_urls, invalid_urls = parse_input_urls(url_text, upload_file)
+    valid_urls, invalid_urls = await asyncio.to_thread(parse_input_urls, url_text, upload_file)
     if invalid_urls:
         for bad in invalid_urls:
             logger(f"[跳过] 非法或不支持域名链接: {bad}")
@@ -269,31 +343,83 @@ def run_batch_export(url_text: str, upload_file: Optional[str]):
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     out_dir = create_run_output_dir(run_id)
     logger(f"任务目录: {out_dir}")
-    logger(f"待处理链接数: {len(valid_urls)}")
+    total = len(valid_urls)
+    logger(f"待处理链接数: {total}")
     yield log_text(), rows, download_files, None, None
 
+    def export_with_buffered_log(url: str) -> Tuple[ExportResult, List[str]]:
+        # 并发执行时各链接的日志先缓存在本地，完成后整体写入，避免不同链接的日志交错
+        url_logs: List[str] = []
+
+        def url_logger(message: str) -> None:
+            url_logs.append(f"[{now_str()}] {message}")
+
+        item = export_one_url(url, out_dir=out_dir, logger=url_logger)
+        return item, url_logs
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_EXPORT_WORKERS)
+
+    async def export_indexed(idx: int, url: str) -> Tuple[int, ExportResult, List[str]]:
+        async with semaphore:
+            item, url_logs = await loop.run_in_executor(_EXPORT_EXECUTOR, export_with_buffered_log, url)
+        return idx, item, url_logs
+
     success_count = 0
     failed_count = 0
-    for idx, url in enumerate(valid_urls, start=1):
-        logger(f"======== 处理进度 {idx}/{len(valid_urls)} ========")
-        item = export_one_url(url, out_dir=out_dir, logger=logger)
-        results.append(item)
-        if item.status == "success":
-            success_count += 1
-            for f in (item.docx_path, item.json_path, item.md_path):
-                if f:
-                    download_files.append(f)
-        else:
-            failed_count += 1
-
-        rows = results_to_rows(results)
-        yield log_text(), rows, download_files, None, None
+    finished: List[Tuple[int, ExportResult]] = []
+    last_yield = time.monotonic()
+    tasks = [asyncio.ensure_future(export_indexed(idx, url)) for idx, url in enumerate(valid_urls)]
+    try:
+        for done, next_finished in enumerate(asyncio.as_completed(tasks), start=1):
+            idx, item, url_logs = await next_finished
+            finished.append((idx, item))
+            logger(f"======== 处理进度 {done}/{total} ========")
+            for line in url_logs:
+                append_log(line)
+            if item.status == "success":
+                success_count += 1
+                for f in (item.docx_path, item.json_path, item.md_path):
+                    if f:
+                        download_files.append(f)
+            else:
+                failed_count += 1
+
+            rows.append(
+                [
+                    str(idx + 1),
+                    item.url,
+                    STATUS_MAP.get(item.status, "失败"),
+                    item.title or "-",
+                    item.message,
+                ]
+            )
+            now = time.monotonic()
+            if done == total or now - last_yield >= UI_REFRESH_INTERVAL:
+                last_yield = now
+                yield log_text(), rows, download_files, None, None
+    finally:
+        # 客户端断开或取消时生成器会被关闭，此时取消尚未完成的导出，避免整批在后台继续跑完
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    # 按输入顺序输出结果清单和文件列表；download_files 是完成顺序，仅用于过程中的实时展示
+    results = [item for _, item in sorted(finished, key=lambda pair: pair[0])]
+    rows = results_to_rows(results)
+    ordered_files = [
+        f
+        for item in results
+        if item.status == "success"
+        for f in (item.docx_path, item.json_path, item.md_path)
+        if f
+    ]
 
     batch = BatchResult(
         success_count=success_count,
         failed_count=failed_count,
         results=results,
-        all_files=download_files.copy(),
+        all_files=dedupe_keep_order(ordered_files),
     )
     logger(f"批量处理结束: 成功 {batch.success_count}，失败 {batch.failed_count}")
 
@@ -305,15 +431,19 @@ def run_batch_export(url_text: str, upload_file: Optional[str]):
     log_path = write_log_file(out_dir, run_id, log_text())
     logger(f"已写入日志文件: {log_path}")
 
-    zip_path = build_zip_bundle(
-        out_dir, run_id, batch.all_files, extras=[results_csv, failed_txt, log_path]
+    zip_path = await asyncio.to_thread(
+        build_zip_bundle,
+        out_dir,
+        run_id,
+        batch.all_files,
+        extras=[results_csv, failed_txt, log_path],
+        logger=logger,
     )
     logger(f"已生成打包文件: {zip_path}")
 
     batch.log_path = str(log_path)
     batch.zip_path = str(zip_path)
-    final_files = dedupe_keep_order(download_files)
-    yield log_text(), rows, final_files, batch.zip_path, batch.log_path
+    yield log_text(), rows, batch.all_files, batch.zip_path, batch.log_path
 
 
 def build_ui() -> gr.Blocks:
@@ -387,10 +517,13 @@ def build_ui() -> gr.Blocks:
 
 
 def main() -> None:
+    # 依赖改为按需导入后，import wjx_to_docx 不再提前失败，需在启动界面前显式检查
+    if not check_dependencies():
+        sys.exit(1)
     demo = build_ui()
     port = find_free_port()
     print(f"[{now_str()}] 启动 Gradio 服务: http://127.0.0.1:{port}")
-    demo.queue(default_concurrency_limit=1).launch(
+    demo.queue(default_concurrency_limit=MAX_CONCURRENT_SESSIONS).launch(
         server_name="127.0.0.1",
         server_port=port,
         inbrowser=True,
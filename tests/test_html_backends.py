@@ -0,0 +1,54 @@
+"""lexbor 与 BeautifulSoup 两种解析后端应得到完全一致的 Survey。"""
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("selectolax")
+
+import wjx_to_docx  # noqa: E402
+
+FIXTURE_HTML = """
+<html><head><title>后端一致性测试</title></head><body>
+<div id="divQuestion">
+  <div class="cutfield"><div>第一部分</div><div>说明文字</div></div>
+  <div class="field ui-field-contain" topic="1" type="3" req="1">
+    <div class="topichtml">你好<style>.a{color:red}</style><script>var a=1;</script> 世界<br>第二行</div>
+    <div class="ui-controlgroup">
+      <div class="ui-radio"><span class="label">选项A</span></div>
+      <div class="ui-radio"><span class="label">选项B</span></div>
+    </div>
+  </div>
+  <div class="cutfield field ui-field-contain"><div>第二部分</div><div>补充</div></div>
+  <div class="field ui-field-contain" topic="2" type="1">
+    <div class="topichtml">请填写</div>
+  </div>
+</div>
+</body></html>
+"""
+
+
+def parse_with(monkeypatch, use_lexbor):
+    monkeypatch.setattr(wjx_to_docx, "USE_LEXBOR", use_lexbor)
+    return wjx_to_docx.parse_survey(FIXTURE_HTML, "https://v.wjx.cn/vm/test.aspx")
+
+
+def test_backends_produce_identical_survey(monkeypatch):
+    lexbor_survey = parse_with(monkeypatch, True)
+    bs4_survey = parse_with(monkeypatch, False)
+    # crawl_time 取自两次独立解析的当前时间，可能跨过秒边界，不参与比较
+    bs4_survey.crawl_time = lexbor_survey.crawl_time
+
+    assert lexbor_survey == bs4_survey
+    assert [section.name for section in bs4_survey.sections] == ["第一部分", "第二部分"]
+    assert bs4_survey.questions[0].stem == "你好 世界 第二行"
+
+
+def test_lexbor_select_all_skips_self_and_duplicates(monkeypatch):
+    monkeypatch.setattr(wjx_to_docx, "USE_LEXBOR", True)
+    tree = wjx_to_docx.parse_html(FIXTURE_HTML)
+    container = wjx_to_docx.select_first(tree, "#divQuestion")
+    nodes = wjx_to_docx.select_all(container, "div.cutfield, div.field.ui-field-contain")
+    assert len(nodes) == 4
+
+    cutfield = nodes[0]
+    assert wjx_to_docx.tag_text(wjx_to_docx.select_first(cutfield, "div")) == "第一部分"
@@ -5,6 +5,7 @@
 
 安装依赖:
     pip install requests beautifulsoup4 python-docx
+    pip install selectolax  # 可选，安装后使用 lexbor 加速解析
 
 使用:
     python wjx_to_docx.py <问卷链接>
@@ -12,25 +13,33 @@
 
 from __future__ import annotations
 
+import functools
+import os
 import re
 import sys
-import time
 import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 from urllib.parse import urlparse
 
-try:
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型注解
     import requests
-    from bs4 import BeautifulSoup, Tag
-    from docx import Document
-    from docx.shared import Cm
-except ImportError as exc:  # pragma: no cover - import guard for runtime
-    print(f"[错误] 缺少依赖: {exc}")
-    print("请先执行: pip install requests beautifulsoup4 python-docx")
-    sys.exit(1)
+
+# requests / bs4 / python-docx 导入较慢，延迟到实际用到的函数内再导入，
+# 使无参数、参数错误等情况可以立即返回；缺少依赖时由 check_dependencies 统一提示
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - 未安装 selectolax 时回退到 BeautifulSoup
+    LexborHTMLParser = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖，未安装时使用标准库 json
+    orjson = None
 
 
 EXIT_INVALID_ARGS = 1
@@ -44,19 +53,48 @@ USER_AGENT = (
     "Chrome/122.0.0.0 Safari/537.36"
 )
 
+# 设置 WJX_CACHE=1 时把页面缓存到本地 SQLite，重复导出同一问卷时无需再次请求
+HTTP_CACHE_NAME = ".wjx_http_cache"
+HTTP_CACHE_EXPIRE_SEC = 3600
 
-@dataclass
+# Gradio 前端的并发上限：同时处理的会话数 × 每个会话的并发导出数。
+# 所有导出线程共用 get_session() 返回的同一个 Session，连接池需按两者乘积设定
+MAX_CONCURRENT_SESSIONS = 4
+MAX_EXPORT_WORKERS = 8
+HTTP_POOL_MAXSIZE = MAX_CONCURRENT_SESSIONS * MAX_EXPORT_WORKERS
+
+# 已安装 selectolax 时使用 lexbor 解析（C 实现，解析与 CSS 查询都快得多），否则回退到 bs4
+USE_LEXBOR = LexborHTMLParser is not None
+
+_TOPIC_RE = re.compile(r"(\d+)")
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_Q_REL_RE = re.compile(r"q(\d+)", re.IGNORECASE)
+_SIGNAL_TOPIC_RE = re.compile(r"q(\d+)|_(\d+)")
+_PASSWORD_RE = re.compile(r"<input[^>]+type=['\"]password['\"]", re.IGNORECASE)
+_VAR_RE = re.compile(r"var\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*([^;]{1,800});", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([A-Za-z0-9_\-]+)", re.IGNORECASE)
+_LOGIC_NAME_KEYS = ("rel", "jump", "logic", "skip", "display", "cond")
+_LOGIC_VALUE_KEYS = ("rel", "jump", "logic", "skip", "display", "condition")
+
+# bs4 的 Tag/BeautifulSoup，或 selectolax 的 LexborNode/LexborHTMLParser
+HtmlNode = Any
+
+
+# Section/Question 数量多且会被三个导出器反复遍历，Python 3.10+ 使用 __slots__ 省去实例 __dict__
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Section:
     name: str
     start_topic: Optional[int] = None
     end_topic: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Question:
     index: int
     topic_id: Optional[int]
-    display_no: str
     qtype: str
     required: bool
     stem: str
@@ -64,6 +102,10 @@ class Question:
     logic_notes: str
     section: str = "题目列表"
 
+    @property
+    def display_no(self) -> str:
+        return str(self.index)
+
 
 @dataclass
 class Survey:
@@ -73,6 +115,22 @@ class Survey:
     crawl_time: str
     sections: List[Section] = field(default_factory=list)
     questions: List[Question] = field(default_factory=list)
+    # 章节名 -> 该章节题目，parse_survey 解析时顺带填充，供各导出器直接复用；
+    # 仅是 questions 的派生索引，不参与 repr 和相等比较
+    questions_by_section: Dict[str, List[Question]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.questions and not self.questions_by_section:
+            self.questions_by_section = group_questions_by_section(self.questions)
+
+
+def group_questions_by_section(questions: List[Question]) -> Dict[str, List[Question]]:
+    groups: Dict[str, List[Question]] = {}
+    for q in questions:
+        groups.setdefault(q.section, []).append(q)
+    return groups
 
 
 class ExportError(Exception):
@@ -87,12 +145,78 @@ def log(message: str) -> None:
 
 
 def normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+    if not text:
+        return ""
+    # str.split() 无参数时按任意空白切分并丢弃首尾空白，与 re.sub(r"\s+", " ") + strip() 等价
+    return " ".join(text.split())
 
 
-def tag_text(tag: Optional[Tag]) -> str:
-    if not tag:
+def parse_html(html: str) -> HtmlNode:
+    if USE_LEXBOR:
+        tree = LexborHTMLParser(html)
+        # bs4 的 get_text 不含 <script>/<style> 内容，lexbor 的 text() 会包含；
+        # 脚本中的逻辑标记另由 extract_global_logic_signals 从原始 HTML 提取，这里可直接移除
+        tree.strip_tags(["script", "style"])
+        return tree
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+def select_all(node: HtmlNode, selector: str) -> List[HtmlNode]:
+    if not USE_LEXBOR:
+        return node.select(selector)
+    # lexbor 的 css() 会匹配调用节点自身，且同一节点命中逗号选择器的多个分支时会重复返回；
+    # 这里排除自身并去重，使结果与 bs4（仅后代、每个节点一次）一致
+    self_id = getattr(node, "mem_id", None)
+    seen = set()
+    result: List[HtmlNode] = []
+    for match in node.css(selector):
+        match_id = match.mem_id
+        if match_id == self_id or match_id in seen:
+            continue
+        seen.add(match_id)
+        result.append(match)
+    return result
+
+
+def select_first(node: HtmlNode, selector: str) -> Optional[HtmlNode]:
+    if not USE_LEXBOR:
+        return node.select_one(selector)
+    first = node.css_first(selector)
+    if first is None or first.mem_id != getattr(node, "mem_id", None):
+        return first
+    # 命中的是调用节点自身时，退回到完整查询取第一个后代
+    matches = select_all(node, selector)
+    return matches[0] if matches else None
+
+
+def node_attrs(node: HtmlNode) -> Dict[str, Any]:
+    # lexbor 每次访问 .attributes 都会新建一个 dict，同一节点取多个属性时先取一次再复用
+    if USE_LEXBOR:
+        return node.attributes
+    return node.attrs
+
+
+def attr_text(attrs: Dict[str, Any], name: str) -> str:
+    value = attrs.get(name)
+    if not value:
+        return ""
+    # bs4 对 class 等多值属性返回 list
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+def node_attr(node: HtmlNode, name: str) -> str:
+    return attr_text(node_attrs(node), name)
+
+
+def tag_text(tag: Optional[HtmlNode]) -> str:
+    if tag is None:
         return ""
+    if USE_LEXBOR:
+        return normalize_text(tag.text(separator=" ", strip=True))
     return normalize_text(tag.get_text(" ", strip=True))
 
 
@@ -106,8 +230,9 @@ def unique_keep_order(items: Sequence[str]) -> List[str]:
     return result
 
 
-def truncate(text: str, max_len: int = 100) -> str:
-    text = normalize_text(text)
+def truncate(text: str, max_len: int = 100, normalized: bool = False) -> str:
+    if not normalized:
+        text = normalize_text(text)
     if len(text) <= max_len:
         return text
     return f"{text[: max_len - 3]}..."
@@ -122,30 +247,69 @@ def validate_url(url: str) -> bool:
     return any(part in host for part in allowed)
 
 
-def fetch_html(url: str, timeout_sec: int = 20, retries: int = 2) -> str:
-    headers = {"User-Agent": USER_AGENT}
-    last_error: Optional[Exception] = None
+def resolve_encoding(response: requests.Response) -> str:
+    # 不使用 apparent_encoding（会用 chardet 扫描整个页面），优先信任响应头，
+    # 其次只看页面前 4KB 的 <meta charset>，都没有时按问卷星实际使用的 UTF-8 处理
+    content_type = response.headers.get("Content-Type", "").lower()
+    if "charset=" in content_type and response.encoding:
+        return response.encoding
+    match = _META_CHARSET_RE.search(response.content[:4096])
+    if match:
+        return match.group(1).decode("ascii")
+    return "utf-8"
+
 
-    for attempt in range(retries + 1):
+@functools.lru_cache(maxsize=None)
+def get_session(retries: int = 2) -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # 复用连接池（keep-alive），重试与退避交给 urllib3 的 Retry 处理
+    retry = Retry(
+        total=retries,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    # 连接池需容纳所有会话的全部导出线程，否则多余连接用完即丢、反复重建
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session: Optional[requests.Session] = None
+    if os.environ.get("WJX_CACHE") == "1":
         try:
-            response = requests.get(url, headers=headers, timeout=timeout_sec)
-            if response.status_code >= 400:
-                raise requests.HTTPError(f"HTTP {response.status_code}")
-            if response.apparent_encoding:
-                response.encoding = response.apparent_encoding
-            return response.text
-        except requests.RequestException as exc:
-            last_error = exc
-            if attempt < retries:
-                sleep_sec = 2**attempt
-                log(f"网络请求失败，{sleep_sec} 秒后重试 ({attempt + 1}/{retries})...")
-                time.sleep(sleep_sec)
-
-    raise ExportError(EXIT_NETWORK, f"网络请求失败: {last_error}")
+            import requests_cache
+        except ImportError:
+            log("未安装 requests-cache，已忽略 WJX_CACHE=1（pip install requests-cache）")
+        else:
+            session = requests_cache.CachedSession(
+                HTTP_CACHE_NAME,
+                backend="sqlite",
+                expire_after=HTTP_CACHE_EXPIRE_SEC,
+                allowable_methods=("GET",),
+                stale_if_error=True,
+            )
+    if session is None:
+        session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def fetch_html(url: str, timeout_sec: int = 20, retries: int = 2) -> str:
+    import requests
+
+    try:
+        response = get_session(retries).get(url, timeout=timeout_sec)
+        if response.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {response.status_code}")
+        response.encoding = resolve_encoding(response)
+        return response.text
+    except requests.RequestException as exc:
+        raise ExportError(EXIT_NETWORK, f"网络请求失败: {exc}") from exc
 
 
 def check_restricted_page(html: str) -> Optional[str]:
-    lower_html = html.lower()
     keyword_reasons = {
         "验证码": "检测到验证码页面，当前版本不支持自动处理验证码。",
         "滑块验证": "检测到滑块验证，当前版本不支持自动处理风控验证。",
@@ -153,11 +317,13 @@ def check_restricted_page(html: str) -> Optional[str]:
         "请先登录": "检测到登录限制页面，当前版本不支持登录态问卷。",
         "访问过于频繁": "检测到频率限制，请稍后重试。",
     }
+    # 关键词均为中文，大小写转换不影响匹配，直接在原文中查找
     for keyword, reason in keyword_reasons.items():
-        if keyword.lower() in lower_html:
+        if keyword in html:
             return reason
 
-    if re.search(r"<input[^>]+type=['\"]password['\"]", html, flags=re.IGNORECASE):
+    # 正则本身忽略大小写，命中即意味着页面含 password，无需先整页转小写做预筛
+    if _PASSWORD_RE.search(html):
         return "检测到密码输入框，当前版本不支持密码问卷。"
 
     return None
@@ -166,7 +332,7 @@ def check_restricted_page(html: str) -> Optional[str]:
 def parse_topic_id(raw: Optional[str]) -> Optional[int]:
     if not raw:
         return None
-    match = re.search(r"(\d+)", str(raw))
+    match = _TOPIC_RE.search(str(raw))
     if not match:
         return None
     return int(match.group(1))
@@ -183,7 +349,7 @@ def map_qtype(type_code: str) -> str:
     return mapping.get(type_code, f"未知类型({type_code or 'N/A'})")
 
 
-def extract_description(soup: BeautifulSoup) -> str:
+def extract_description(soup: HtmlNode) -> str:
     candidates = [
         "#divDesc",
         "#desc",
@@ -192,59 +358,64 @@ def extract_description(soup: BeautifulSoup) -> str:
         ".survey-desc",
     ]
     for selector in candidates:
-        node = soup.select_one(selector)
+        node = select_first(soup, selector)
         text = tag_text(node)
         if text:
             return text
 
-    meta_desc = soup.select_one("meta[property='og:description']")
-    if meta_desc and meta_desc.get("content"):
-        return normalize_text(str(meta_desc.get("content")))
+    meta_desc = select_first(soup, "meta[property='og:description']")
+    if meta_desc is not None:
+        return normalize_text(node_attr(meta_desc, "content"))
     return ""
 
 
-def is_cutfield(node: Tag) -> bool:
-    classes = node.get("class", [])
-    return "cutfield" in classes
-
-
-def is_question_field(node: Tag) -> bool:
-    classes = node.get("class", [])
-    return "field" in classes and "ui-field-contain" in classes
-
-
 def extract_global_logic_signals(html: str) -> Dict[str, str]:
     signals: Dict[str, str] = {}
-    pattern = re.compile(
-        r"var\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*([^;]{1,800});", re.IGNORECASE
-    )
-    for name, value in pattern.findall(html):
-        if re.search(r"(rel|jump|logic|skip|display|cond)", name, re.IGNORECASE):
+    if "var" not in html:
+        return signals
+    for name, value in _VAR_RE.findall(html):
+        lower_name = name.lower()
+        if any(key in lower_name for key in _LOGIC_NAME_KEYS):
             clean_value = truncate(value, 140)
             signals[name] = clean_value
             continue
-        if re.search(r"(rel|jump|logic|skip|display|condition)", value, re.IGNORECASE):
+        lower_value = value.lower()
+        if any(key in lower_value for key in _LOGIC_VALUE_KEYS):
             signals[name] = truncate(value, 140)
     return signals
 
 
-def extract_option_labels(node: Tag, selector: str) -> List[str]:
+def index_signals_by_topic(global_signals: Dict[str, str]) -> Dict[int, List[str]]:
+    # 按题号建立脚本标记的倒排索引：每个标记只扫描一次，逐题查找时为 O(1)
+    index: Dict[int, List[str]] = {}
+    for name, value in global_signals.items():
+        entry = f"{name}={truncate(value, 70, normalized=True)}"
+        topic_ids = set()
+        for q_no, underscore_no in _SIGNAL_TOPIC_RE.findall(value.lower()):
+            topic_ids.add(int(q_no or underscore_no))
+        for topic_id in topic_ids:
+            index.setdefault(topic_id, []).append(entry)
+    return index
+
+
+def extract_option_labels(node: HtmlNode, selector: str) -> List[str]:
     labels: List[str] = []
-    for label in node.select(selector):
+    for label in select_all(node, selector):
         text = tag_text(label)
         if text:
             labels.append(text)
     return unique_keep_order(labels)
 
 
-def extract_scale_options(node: Tag) -> str:
-    left = tag_text(node.select_one(".scaleTitle_frist"))
-    right = tag_text(node.select_one(".scaleTitle_last"))
+def extract_scale_options(node: HtmlNode) -> str:
+    left = tag_text(select_first(node, ".scaleTitle_frist"))
+    right = tag_text(select_first(node, ".scaleTitle_last"))
     anchors: List[str] = []
-    for anchor in node.select(".scale-rating a[val], .scale-div a[val]"):
-        val = normalize_text(str(anchor.get("val", "")))
-        title = normalize_text(str(anchor.get("title", ""))) or normalize_text(
-            str(anchor.get("htitle", ""))
+    for anchor in select_all(node, ".scale-rating a[val], .scale-div a[val]"):
+        attrs = node_attrs(anchor)
+        val = normalize_text(attr_text(attrs, "val"))
+        title = normalize_text(attr_text(attrs, "title")) or normalize_text(
+            attr_text(attrs, "htitle")
         )
         if not val:
             continue
@@ -260,16 +431,16 @@ def extract_scale_options(node: Tag) -> str:
     return "\n".join(lines) if lines else "（量表题，未提取到刻度文本）"
 
 
-def extract_matrix_options(node: Tag) -> str:
-    table = node.select_one("table.matrix-rating, table.matrixtable")
+def extract_matrix_options(node: HtmlNode) -> str:
+    table = select_first(node, "table.matrix-rating, table.matrixtable")
     if not table:
         return "（矩阵题，未提取到表格结构）"
 
-    rows = table.select("tr")
+    rows = select_all(table, "tr")
     if not rows:
         return "（矩阵题，表格内容为空）"
 
-    header_cells = rows[0].find_all(["th", "td"])
+    header_cells = select_all(rows[0], "th, td")
     headers = [tag_text(cell) for cell in header_cells]
     if headers and not headers[0]:
         headers = headers[1:]
@@ -277,10 +448,11 @@ def extract_matrix_options(node: Tag) -> str:
 
     row_labels: List[str] = []
     for row in rows[1:]:
-        cells = row.find_all(["th", "td"])
-        if not cells:
+        # 除表头外每行只需要首个单元格作为行标签
+        first_cell = select_first(row, "th, td")
+        if first_cell is None:
             continue
-        first = tag_text(cells[0])
+        first = tag_text(first_cell)
         if first:
             row_labels.append(first)
 
@@ -293,7 +465,7 @@ def extract_matrix_options(node: Tag) -> str:
     return "\n".join(lines) if lines else "（矩阵题，未提取到有效行列文本）"
 
 
-def extract_options(node: Tag, type_code: str) -> str:
+def extract_options(node: HtmlNode, type_code: str) -> str:
     if type_code == "3":
         labels = extract_option_labels(node, ".ui-radio .label")
         return "；".join(labels) if labels else "（单选题，未提取到选项）"
@@ -314,9 +486,10 @@ def extract_options(node: Tag, type_code: str) -> str:
 
 
 def extract_logic_notes(
-    node: Tag, topic_id: Optional[int], global_signals: Dict[str, str]
+    node: HtmlNode, topic_id: Optional[int], signals_by_topic: Dict[int, List[str]]
 ) -> str:
     notes: List[str] = []
+    attrs = node_attrs(node)
 
     question_attrs = [
         "relation",
@@ -330,39 +503,36 @@ def extract_logic_notes(
         "display",
     ]
     for attr in question_attrs:
-        value = normalize_text(str(node.get(attr, "")))
+        value = normalize_text(attr_text(attrs, attr))
         if value:
             notes.append(f"题属性 {attr}={value}")
 
-    style = normalize_text(str(node.get("style", ""))).lower().replace(" ", "")
+    style = normalize_text(attr_text(attrs, "style")).lower().replace(" ", "")
     if "display:none" in style:
         notes.append("题目初始隐藏（style=display:none）")
 
-    for input_tag in node.select("input, option"):
+    for input_tag in select_all(node, "input, option"):
+        input_attrs = node_attrs(input_tag)
         opt_id = (
-            normalize_text(str(input_tag.get("id", "")))
-            or normalize_text(str(input_tag.get("name", "")))
-            or normalize_text(str(input_tag.get("value", "")))
+            normalize_text(attr_text(input_attrs, "id"))
+            or normalize_text(attr_text(input_attrs, "name"))
+            or normalize_text(attr_text(input_attrs, "value"))
             or "未知选项"
         )
-        jumpto = normalize_text(str(input_tag.get("jumpto", "")))
-        rel = normalize_text(str(input_tag.get("rel", "")))
+        jumpto = normalize_text(attr_text(input_attrs, "jumpto"))
+        rel = normalize_text(attr_text(input_attrs, "rel"))
         if jumpto:
             notes.append(f"选项 {opt_id} 跳转到 {jumpto}")
         if rel:
             guess = ""
-            match = re.search(r"q(\d+)", rel, flags=re.IGNORECASE)
+            match = _Q_REL_RE.search(rel)
             if match:
                 guess = f"（可能关联题 {match.group(1)}）"
             notes.append(f"选项 {opt_id} 触发关联字段 {rel}{guess}")
 
     topic_signals: List[str] = []
     if topic_id is not None:
-        q_key = f"q{topic_id}".lower()
-        for name, value in global_signals.items():
-            lower_value = value.lower()
-            if q_key in lower_value or f"_{topic_id}" in lower_value:
-                topic_signals.append(f"{name}={truncate(value, 70)}")
+        topic_signals = signals_by_topic.get(topic_id, [])
 
     notes = unique_keep_order(notes)
     if notes:
@@ -378,24 +548,29 @@ def extract_logic_notes(
 
 
 def parse_question(
-    node: Tag, display_index: int, section_name: str, global_signals: Dict[str, str]
+    node: HtmlNode,
+    display_index: int,
+    section_name: str,
+    signals_by_topic: Dict[int, List[str]],
 ) -> Question:
-    topic_id = parse_topic_id(node.get("topic"))
-    type_code = normalize_text(str(node.get("type", "")))
+    attrs = node_attrs(node)
+    topic_id = parse_topic_id(attr_text(attrs, "topic"))
+    type_code = normalize_text(attr_text(attrs, "type"))
     qtype = map_qtype(type_code)
 
-    required_attr = normalize_text(str(node.get("req", ""))) == "1"
-    required_star = node.select_one(".field-label .req") is not None
-    required = required_attr or required_star
+    # req="1" 已能确定必填时不再查找星号节点
+    required = (
+        normalize_text(attr_text(attrs, "req")) == "1"
+        or select_first(node, ".field-label .req") is not None
+    )
 
-    stem = tag_text(node.select_one(".topichtml")) or "（未识别题干）"
+    stem = tag_text(select_first(node, ".topichtml")) or "（未识别题干）"
     options = extract_options(node, type_code)
-    logic_notes = extract_logic_notes(node, topic_id, global_signals)
+    logic_notes = extract_logic_notes(node, topic_id, signals_by_topic)
 
     return Question(
         index=display_index,
         topic_id=topic_id,
-        display_no=str(display_index),
         qtype=qtype,
         required=required,
         stem=stem,
@@ -405,10 +580,14 @@ def parse_question(
     )
 
 
-def build_sections(questions: List[Question], ordered_names: List[str]) -> List[Section]:
+def build_sections(
+    questions_by_section: Dict[str, List[Question]], ordered_names: List[str]
+) -> List[Section]:
     sections: List[Section] = []
     for name in ordered_names:
-        topics = [q.topic_id for q in questions if q.section == name and q.topic_id is not None]
+        topics = [
+            q.topic_id for q in questions_by_section.get(name, ()) if q.topic_id is not None
+        ]
         start_topic = min(topics) if topics else None
         end_topic = max(topics) if topics else None
         if not topics and name != "题目列表":
@@ -431,40 +610,46 @@ def parse_survey(html: str, source_url: str) -> Survey:
     if reason:
         raise ExportError(EXIT_PARSE, reason)
 
-    soup = BeautifulSoup(html, "html.parser")
-    container = soup.select_one("#divQuestion")
-    if not container:
+    soup = parse_html(html)
+    container = select_first(soup, "#divQuestion")
+    if container is None:
         raise ExportError(EXIT_PARSE, "页面中未找到题目容器 #divQuestion。")
 
-    title = tag_text(soup.select_one("#htitle")) or tag_text(soup.title) or "问卷导出"
+    title = (
+        tag_text(select_first(soup, "#htitle"))
+        or tag_text(select_first(soup, "title"))
+        or "问卷导出"
+    )
     description = extract_description(soup)
     crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    global_signals = extract_global_logic_signals(html)
+    signals_by_topic = index_signals_by_topic(extract_global_logic_signals(html))
 
     ordered_names: List[str] = ["题目列表"]
     current_section = "题目列表"
     questions: List[Question] = []
+    questions_by_section: Dict[str, List[Question]] = {}
 
-    nodes: List[Tag] = container.find_all("div")
+    # 只取章节标题和题目两类节点，避免逐个遍历容器内的所有 div
+    nodes: List[HtmlNode] = select_all(container, "div.cutfield, div.field.ui-field-contain")
     display_index = 0
     for node in nodes:
-        if is_cutfield(node):
-            section_name = tag_text(node.find("div")) or tag_text(node)
+        if "cutfield" in node_attr(node, "class").split():
+            section_name = tag_text(select_first(node, "div")) or tag_text(node)
             if section_name:
                 current_section = section_name
                 if current_section not in ordered_names:
                     ordered_names.append(current_section)
             continue
 
-        if is_question_field(node):
-            display_index += 1
-            question = parse_question(node, display_index, current_section, global_signals)
-            questions.append(question)
+        display_index += 1
+        question = parse_question(node, display_index, current_section, signals_by_topic)
+        questions.append(question)
+        questions_by_section.setdefault(current_section, []).append(question)
 
     if not questions:
         raise ExportError(EXIT_PARSE, "页面解析完成，但未识别到题目。")
 
-    sections = build_sections(questions, ordered_names)
+    sections = build_sections(questions_by_section, ordered_names)
     return Survey(
         title=title,
         description=description,
@@ -472,12 +657,13 @@ def parse_survey(html: str, source_url: str) -> Survey:
         crawl_time=crawl_time,
         sections=sections,
         questions=questions,
+        questions_by_section=questions_by_section,
     )
 
 
 def sanitize_filename(name: str) -> str:
     name = normalize_text(name)
-    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name)
+    name = _SANITIZE_RE.sub("_", name)
     name = name.strip(" .")
     if not name:
         name = "wjx_export"
@@ -486,38 +672,51 @@ def sanitize_filename(name: str) -> str:
     return name
 
 
+OUTPUT_SUFFIXES = (".docx", ".json", ".md")
+
+
 def build_output_paths(title: str) -> Dict[str, Path]:
     base = sanitize_filename(title)
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     cwd = Path.cwd()
 
-    for idx in range(0, 1000):
-        if idx == 0:
-            stem = base
-        elif idx == 1:
-            stem = f"{base}_{stamp}"
-        else:
-            stem = f"{base}_{stamp}_{idx}"
+    # 一次列出当前目录，之后的冲突判断都是集合查找；按 casefold 比较以兼容大小写不敏感的文件系统
+    with os.scandir(cwd) as entries:
+        taken = {entry.name.casefold() for entry in entries}
 
-        paths = {
-            "docx": cwd / f"{stem}.docx",
-            "json": cwd / f"{stem}.json",
-            "md": cwd / f"{stem}.md",
-        }
-        if not any(path.exists() for path in paths.values()):
-            return paths
+    def is_free(stem: str) -> bool:
+        return all(f"{stem}{suffix}".casefold() not in taken for suffix in OUTPUT_SUFFIXES)
+
+    stem = base
+    if not is_free(stem):
+        stem = f"{base}_{stamp}"
+    if not is_free(stem):
+        # 同一秒内重复导出同名问卷时才会走到这里
+        stem = f"{base}_{stamp}_{uuid.uuid4().hex[:6]}"
 
-    raise ExportError(EXIT_DOCX, "输出文件名冲突过多，请稍后重试。")
+    return {suffix[1:]: cwd / f"{stem}{suffix}" for suffix in OUTPUT_SUFFIXES}
 
 
 def set_table_col_widths(table, widths_cm: Sequence[float]) -> None:
+    from docx.shared import Cm
+
     widths = [Cm(v) for v in widths_cm]
     for row in table.rows:
         for idx, width in enumerate(widths):
             row.cells[idx].width = width
 
 
+def fill_row_text(row, texts: Sequence[str]) -> None:
+    # 新行的每个单元格都自带一个空段落，直接在其 XML 上追加 run；
+    # 避免 cell.text 先清空单元格再重建段落，也省去 row.cells 构造 _Cell 对象的开销。
+    # run.text 的 setter 仍会把 \n、\t 转成 <w:br/>、<w:tab/>，与 cell.text 输出一致
+    for tc, text in zip(row._tr.tc_lst, texts):
+        tc.p_lst[0].add_r().text = text
+
+
 def write_docx(survey: Survey, output_path: Path) -> None:
+    from docx import Document
+
     try:
         doc = Document()
         doc.add_heading(survey.title, level=0)
@@ -528,7 +727,7 @@ def write_docx(survey: Survey, output_path: Path) -> None:
         doc.add_paragraph(f"题目总数：{len(survey.questions)}")
 
         for section in survey.sections:
-            section_questions = [q for q in survey.questions if q.section == section.name]
+            section_questions = survey.questions_by_section.get(section.name)
             if not section_questions:
                 continue
             doc.add_heading(section.name, level=2)
@@ -536,18 +735,21 @@ def write_docx(survey: Survey, output_path: Path) -> None:
             table = doc.add_table(rows=1, cols=6)
             table.style = "Table Grid"
             headers = ["题号", "题型", "必填", "题干", "选项", "逻辑"]
-            for i, text in enumerate(headers):
-                table.rows[0].cells[i].text = text
+            fill_row_text(table.rows[0], headers)
             set_table_col_widths(table, [1.2, 1.8, 1.0, 4.5, 4.0, 3.0])
 
             for q in section_questions:
-                row = table.add_row().cells
-                row[0].text = q.display_no
-                row[1].text = q.qtype
-                row[2].text = "是" if q.required else "否"
-                row[3].text = q.stem
-                row[4].text = q.options
-                row[5].text = q.logic_notes
+                fill_row_text(
+                    table.add_row(),
+                    [
+                        q.display_no,
+                        q.qtype,
+                        "是" if q.required else "否",
+                        q.stem,
+                        q.options,
+                        q.logic_notes,
+                    ],
+                )
 
             doc.add_paragraph("")
 
@@ -558,24 +760,25 @@ def write_docx(survey: Survey, output_path: Path) -> None:
 
 def survey_to_dict(survey: Survey) -> Dict[str, object]:
     question_items: List[Dict[str, object]] = []
+    items_by_section: Dict[str, List[Dict[str, object]]] = {}
     for q in survey.questions:
-        question_items.append(
-            {
-                "index": q.index,
-                "topic_id": q.topic_id,
-                "display_no": q.display_no,
-                "qtype": q.qtype,
-                "required": q.required,
-                "stem": q.stem,
-                "options": q.options,
-                "logic_notes": q.logic_notes,
-                "section": q.section,
-            }
-        )
+        item: Dict[str, object] = {
+            "index": q.index,
+            "topic_id": q.topic_id,
+            "display_no": q.display_no,
+            "qtype": q.qtype,
+            "required": q.required,
+            "stem": q.stem,
+            "options": q.options,
+            "logic_notes": q.logic_notes,
+            "section": q.section,
+        }
+        question_items.append(item)
+        items_by_section.setdefault(q.section, []).append(item)
 
     section_items: List[Dict[str, object]] = []
     for s in survey.sections:
-        sec_questions = [q for q in question_items if q["section"] == s.name]
+        sec_questions = items_by_section.get(s.name, [])
         section_items.append(
             {
                 "name": s.name,
@@ -601,13 +804,37 @@ def survey_to_dict(survey: Survey) -> Dict[str, object]:
 def write_json(survey: Survey, output_path: Path) -> None:
     try:
         payload = survey_to_dict(survey)
-        output_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        if orjson is not None:
+            output_path.write_bytes(
+                orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            output_path.write_text(
+                json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
     except Exception as exc:
         raise ExportError(EXIT_DOCX, f"JSON 写入失败: {exc}") from exc
 
 
+# 每题一段，整体格式化后作为一个元素加入 lines，末尾换行与下一段之间形成空行
+MD_QUESTION_TEMPLATE = (
+    "### Q{display_no}\n"
+    "- index: {index}\n"
+    "- topic_id: {topic_id}\n"
+    "- qtype: {qtype}\n"
+    "- required: {required}\n"
+    "- stem: {stem}\n"
+    "- options:\n"
+    "```text\n"
+    "{options}\n"
+    "```\n"
+    "- logic_notes:\n"
+    "```text\n"
+    "{logic_notes}\n"
+    "```\n"
+)
+
+
 def render_markdown(survey: Survey) -> str:
     lines: List[str] = []
     lines.append(f"# {survey.title}")
@@ -621,7 +848,7 @@ def render_markdown(survey: Survey) -> str:
     lines.append("")
 
     for section in survey.sections:
-        section_questions = [q for q in survey.questions if q.section == section.name]
+        section_questions = survey.questions_by_section.get(section.name)
         if not section_questions:
             continue
         lines.append(f"## 章节: {section.name}")
@@ -631,21 +858,18 @@ def render_markdown(survey: Survey) -> str:
         lines.append("")
 
         for q in section_questions:
-            lines.append(f"### Q{q.display_no}")
-            lines.append(f"- index: {q.index}")
-            lines.append(f"- topic_id: {q.topic_id if q.topic_id is not None else 'N/A'}")
-            lines.append(f"- qtype: {q.qtype}")
-            lines.append(f"- required: {'是' if q.required else '否'}")
-            lines.append(f"- stem: {q.stem}")
-            lines.append("- options:")
-            lines.append("```text")
-            lines.append(q.options)
-            lines.append("```")
-            lines.append("- logic_notes:")
-            lines.append("```text")
-            lines.append(q.logic_notes)
-            lines.append("```")
-            lines.append("")
+            lines.append(
+                MD_QUESTION_TEMPLATE.format(
+                    display_no=q.display_no,
+                    index=q.index,
+                    topic_id=q.topic_id if q.topic_id is not None else "N/A",
+                    qtype=q.qtype,
+                    required="是" if q.required else "否",
+                    stem=q.stem,
+                    options=q.options,
+                    logic_notes=q.logic_notes,
+                )
+            )
 
     return "\n".join(lines).rstrip() + "\n"
 
@@ -657,6 +881,20 @@ def write_markdown(survey: Survey, output_path: Path) -> None:
         raise ExportError(EXIT_DOCX, f"Markdown 写入失败: {exc}") from exc
 
 
+def check_dependencies() -> bool:
+    try:
+        import requests  # noqa: F401
+        import docx  # noqa: F401
+
+        if not USE_LEXBOR:
+            import bs4  # noqa: F401
+    except ImportError as exc:
+        print(f"[错误] 缺少依赖: {exc}")
+        print("请先执行: pip install requests beautifulsoup4 python-docx")
+        return False
+    return True
+
+
 def print_usage() -> None:
     print("用法: python wjx_to_docx.py <问卷链接>")
     print("示例: python wjx_to_docx.py https://v.wjx.cn/vm/aaaaa.aspx")
@@ -673,6 +911,9 @@ def main(argv: List[str]) -> int:
         print_usage()
         return EXIT_INVALID_ARGS
 
+    if not check_dependencies():
+        return EXIT_INVALID_ARGS
+
     try:
         log("开始请求问卷页面...")
         html = fetch_html(url)
@@ -681,12 +922,13 @@ def main(argv: List[str]) -> int:
         log(f"解析完成: 共识别 {len(survey.questions)} 题。")
 
         output_paths = build_output_paths(survey.title)
-        log("开始生成 Word 文档...")
-        write_docx(survey, output_paths["docx"])
-        log("开始生成 JSON 文件...")
-        write_json(survey, output_paths["json"])
-        log("开始生成 Markdown 文件...")
-        write_markdown(survey, output_paths["md"])
+        log("开始生成 Word / JSON / Markdown 文件...")
+        # 三种导出互不依赖，并行执行；任一失败时 future.result() 会重新抛出其 ExportError
+        writers = ((write_docx, "docx"), (write_json, "json"), (write_markdown, "md"))
+        with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+            futures = [pool.submit(writer, survey, output_paths[key]) for writer, key in writers]
+            for future in as_completed(futures):
+                future.result()
         log("导出完成:")
         log(f"- DOCX: {output_paths['docx']}")
         log(f"- JSON: {output_paths['json']}")